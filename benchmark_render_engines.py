@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""
+Compare the time taken by the Pillow and NumPy compositing engines
+"""
+
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import time
+
+import click
+from PIL import ImageChops
+
+from requirement_images import (
+    RENDER_ENGINES,
+    get_numpy,
+    get_text_sprite,
+    make_row,
+)
+
+
+def make_benchmark_rows(library_count):
+    """A synthetic project layout with a tall lib folder"""
+    rows = [
+        make_row("CIRCUITPY", 1, triangle="down_triangle"),
+        make_row(".fseventsd", 2, hidden=True, triangle="right_triangle"),
+        make_row(".metadata_never_index", 2, icon="file_empty_hidden", hidden=True),
+        make_row(".Trashes", 2, icon="file_empty_hidden", hidden=True),
+        make_row("boot_out.txt", 2),
+        make_row("code.py", 2, icon="file"),
+        make_row("settings.toml", 2, icon="file"),
+        make_row("lib", 2, triangle="down_triangle"),
+    ]
+    for i in range(library_count):
+        if i % 3:
+            rows.append(make_row(f"adafruit_benchmark_module_{i}.mpy", 3))
+        else:
+            rows.append(
+                make_row(
+                    f"adafruit_benchmark_package_{i}", 3, triangle="right_triangle"
+                )
+            )
+    rows.append(make_row("sd", 2, triangle="right_triangle"))
+    return rows
+
+
+def time_engine(render_function, rows, scale, iterations):
+    """Return the first (cold cache) and mean warm time of rendering the rows"""
+    start = time.perf_counter()
+    render_function(rows, scale=scale)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render_function(rows, scale=scale)
+    warm = (time.perf_counter() - start) / iterations
+    return cold, warm
+
+
+@click.command()
+@click.option("--libraries", default=60, show_default=True, help="Rows in lib/.")
+@click.option("--scale", default=1, show_default=True, help="Scale to render at.")
+@click.option("--iterations", default=20, show_default=True, help="Timed renders.")
+def main(libraries, scale, iterations):
+    """Render the same layout with each engine and report the timings"""
+    if get_numpy() is None:
+        raise click.ClickException("NumPy is required to compare the engines")
+
+    rows = make_benchmark_rows(libraries)
+    print(f"{len(rows)} rows at {scale}x, {iterations} iterations")
+
+    images = {}
+    for engine, render_function in RENDER_ENGINES.items():
+        get_text_sprite.cache_clear()
+        cold, warm = time_engine(render_function, rows, scale, iterations)
+        images[engine] = render_function(rows, scale=scale)
+        print(f"{engine:>8}: first {cold * 1000:8.2f} ms, then {warm * 1000:8.2f} ms")
+
+    difference = ImageChops.difference(images["pillow"], images["numpy"]).getbbox()
+    print("identical output" if difference is None else f"differs in {difference}")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
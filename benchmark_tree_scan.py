@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+"""
+Compare the time taken to list the learn guide repo with os.walk and with
+scan_learn_guide_tree, with and without its cache
+"""
+
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import tempfile
+import time
+
+import click
+
+import get_imports
+
+
+def report(label, function, *args, **kwargs):
+    """Time a call and print how long it took"""
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    print(f"{label:>16}: {time.perf_counter() - start:8.3f} s")
+
+
+def walk_repo(top):
+    """List the repo like project discovery did before the tree scan"""
+    for _, dirnames, _ in os.walk(top):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+
+
+@click.command()
+@click.option(
+    "--repo",
+    default=get_imports.LEARN_GUIDE_REPO,
+    show_default=True,
+    help="Learn guide repo to list.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Threads listing the repo; by default the scan picks.",
+)
+@click.option("--project", help="A single project to time scanning on its own.")
+def main(repo, workers, project):
+    """Time each way of listing the repo"""
+    get_imports.LEARN_GUIDE_REPO = os.path.join(repo, "")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        get_imports.LEARN_GUIDE_TREE_CACHE = os.path.join(cache_dir, "cache.json")
+
+        report("os.walk", walk_repo, repo)
+        report("scan, no cache", get_imports.scan_learn_guide_tree, max_workers=workers)
+        report(
+            "scan, warm cache", get_imports.scan_learn_guide_tree, max_workers=workers
+        )
+        if project:
+            report("one project", get_imports.scan_learn_guide_tree, project)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Find the learn guides whose requirement images change with a bundle update
+"""
+
+import json
+import os
+import shutil
+
+from get_imports import (
+    ADAFRUIT_BUNDLE_DATA,
+    COMMUNITY_BUNDLE_DATA,
+    bundle_data,
+    community_bundle_data,
+    sort_libraries,
+)
+
+# The names each guide imports and copies of the bundle data, from the last
+# full or --changed-only run of the learn command. They are kept in a record
+# folder below the output directory, see get_record_dir.
+RENDER_RECORD_DIR = ".render_record"
+GUIDE_IMPORTS = "guide_imports.json"
+RENDERED_BUNDLE_DATA = "rendered_bundle_data.json"
+RENDERED_COMMUNITY_BUNDLE_DATA = "rendered_community_bundle_data.json"
+
+
+def get_record_dir(output_dir, formats=("png",), scales=(1,)):
+    """
+    The folder keeping the render record of a set of outputs. Every output
+    directory and combination of formats and scales has its own record, as
+    a run only brings its own files up to date.
+    """
+    formats_key = "-".join(sorted(set(formats)))
+    scales_key = "-".join(f"{scale}x" for scale in sorted(set(scales)))
+    return os.path.join(output_dir, RENDER_RECORD_DIR, f"{formats_key}@{scales_key}")
+
+
+def load_json_file(path):
+    """Load a JSON file, or return None if it does not exist"""
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r", encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def in_bundles(lib_name, bundles):
+    """Whether a library is in any of the bundles"""
+    return any(lib_name in bundle for bundle in bundles)
+
+
+def get_changed_libraries(libraries, old_bundles, new_bundles):
+    """
+    Find the libraries whose resolved list of packages and modules differs
+    between two versions of the bundles, i.e. whose own entry or any of
+    whose transitive dependencies changed. Libraries that joined or left
+    the bundles count as changed too, as guides only show imports that are
+    in a bundle.
+    """
+    return {
+        lib_name
+        for lib_name in libraries
+        if in_bundles(lib_name, old_bundles) != in_bundles(lib_name, new_bundles)
+        or sort_libraries([lib_name], old_bundles)
+        != sort_libraries([lib_name], new_bundles)
+    }
+
+
+def get_affected_guides(guides, record_dir):
+    """
+    Pick the guides whose images may have changed since they were last
+    rendered: those importing a library whose presence in the bundles or
+    dependencies changed, and those that were not rendered before.
+    Returns None if there is no record of the last render to compare with.
+
+    :param guides: the guides in the learn guide repo
+    :param str record_dir: the folder of the record, from get_record_dir
+    """
+    guide_imports = load_json_file(os.path.join(record_dir, GUIDE_IMPORTS))
+    old_bundles = (
+        load_json_file(os.path.join(record_dir, RENDERED_BUNDLE_DATA)),
+        load_json_file(os.path.join(record_dir, RENDERED_COMMUNITY_BUNDLE_DATA)),
+    )
+    if guide_imports is None or None in old_bundles:
+        return None
+
+    # Imported name -> the guides importing it
+    index = {}
+    for guide, imports in guide_imports.items():
+        for lib_name in imports:
+            index.setdefault(lib_name, []).append(guide)
+
+    changed_libraries = get_changed_libraries(
+        index, old_bundles, (bundle_data, community_bundle_data)
+    )
+    print(f"Libraries with changed dependencies: {sorted(changed_libraries)}")
+    changed_guides = {
+        guide for lib_name in changed_libraries for guide in index[lib_name]
+    }
+    new_guides = [guide for guide in guides if guide not in guide_imports]
+    print(f"Guides not rendered before: {len(new_guides)}")
+    return [
+        guide
+        for guide in guides
+        if guide in changed_guides or guide not in guide_imports
+    ]
+
+
+def save_render_record(guide_imports, record_dir, replace=True):
+    """
+    Record what the images were rendered from: the names each guide imports,
+    bundled or not, and a copy of the bundle data used.
+
+    :param dict guide_imports: guide -> names it imports, for the guides rendered
+    :param str record_dir: the folder of the record, from get_record_dir
+    :param bool replace: start a new record instead of updating the old one
+    """
+    record_file_path = os.path.join(record_dir, GUIDE_IMPORTS)
+    record = {} if replace else load_json_file(record_file_path) or {}
+    record.update({guide: sorted(imports) for guide, imports in guide_imports.items()})
+
+    os.makedirs(record_dir, exist_ok=True)
+    with open(record_file_path, "w", encoding="utf-8") as record_file:
+        json.dump(record, record_file, indent=1, sort_keys=True)
+    shutil.copyfile(
+        ADAFRUIT_BUNDLE_DATA, os.path.join(record_dir, RENDERED_BUNDLE_DATA)
+    )
+    shutil.copyfile(
+        COMMUNITY_BUNDLE_DATA, os.path.join(record_dir, RENDERED_COMMUNITY_BUNDLE_DATA)
+    )
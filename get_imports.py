@@ -7,11 +7,12 @@
 Get the list of required libraries based on a file's imports
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
-import findimports
-import requests
 
+# requests and findimports are slow to import, so the functions that need
+# them import them; the bundle and listing helpers stay cheap to import.
 
 ADAFRUIT_BUNDLE_DATA = "latest_bundle_data.json"
 ADAFRUIT_BUNDLE_TAG = "latest_bundle_tag.json"
@@ -28,6 +29,10 @@ LEARN_GUIDE_REPO = os.environ.get(
     "LEARN_GUIDE_REPO", "../Adafruit_Learning_System_Guides/"
 )
 
+# Directory listings of the learn guide repo from the last run, so that
+# directories whose mtime has not changed are not listed again.
+LEARN_GUIDE_TREE_CACHE = "learn_guide_tree_cache.json"
+
 SHOWN_FILETYPES = [
     "py",
     "mpy",
@@ -53,6 +58,8 @@ SHOWN_FILETYPES_EXAMPLE = [s for s in SHOWN_FILETYPES if s != "py"]
 
 def get_bundle(bundle_url, bundle_data_file):
     """Download the Adafruit and Community bundles data"""
+    import requests  # pylint: disable=import-outside-toplevel
+
     print(f"get bundle metadata from {bundle_url}")
     r = requests.get(bundle_url)
     with open(bundle_data_file, "wb") as bundle_file:
@@ -65,6 +72,7 @@ def get_latest_release_from_url(url):
 
     :return: The most recent tag value for the release.
     """
+    import requests  # pylint: disable=import-outside-toplevel
 
     print(f"Requesting redirect information: {url}")
     response = requests.head(url)
@@ -91,6 +99,8 @@ def ensure_latest_bundle(bundle_url, bundle_s3_url, bundle_tag_file, bundle_data
     Ensure that there's a copy of the latest library bundle available so circup
     can check the metadata contained therein.
     """
+    import requests  # pylint: disable=import-outside-toplevel
+
     print("Checking for library updates.")
     tag = get_latest_tag(bundle_url)
     old_tag = "0"
@@ -121,49 +131,266 @@ def ensure_latest_bundle(bundle_url, bundle_s3_url, bundle_tag_file, bundle_data
         print(f"Current library bundle up to date {tag}")
 
 
-ensure_latest_bundle(
-    "https://github.com/adafruit/Adafruit_CircuitPython_Bundle/releases/latest",
-    ADAFRUIT_BUNDLE_S3_URL,
-    ADAFRUIT_BUNDLE_TAG,
-    ADAFRUIT_BUNDLE_DATA,
-)
-ensure_latest_bundle(
-    "https://github.com/adafruit/CircuitPython_Community_Bundle/releases/latest",
-    COMMUNITY_BUNDLE_S3_URL,
-    COMMUNITY_BUNDLE_TAG,
-    COMMUNITY_BUNDLE_DATA,
-)
+def ensure_latest_bundles():
+    """Ensure that the latest Adafruit and Community bundle data is downloaded"""
+    ensure_latest_bundle(
+        "https://github.com/adafruit/Adafruit_CircuitPython_Bundle/releases/latest",
+        ADAFRUIT_BUNDLE_S3_URL,
+        ADAFRUIT_BUNDLE_TAG,
+        ADAFRUIT_BUNDLE_DATA,
+    )
+    ensure_latest_bundle(
+        "https://github.com/adafruit/CircuitPython_Community_Bundle/releases/latest",
+        COMMUNITY_BUNDLE_S3_URL,
+        COMMUNITY_BUNDLE_TAG,
+        COMMUNITY_BUNDLE_DATA,
+    )
 
-with open(ADAFRUIT_BUNDLE_DATA, "r", encoding="utf-8") as f:
-    bundle_data = json.load(f)
 
-with open(COMMUNITY_BUNDLE_DATA, "r", encoding="utf-8") as f:
-    community_bundle_data = json.load(f)
+# Filled in by load_bundle_data; updated in place so that modules which
+# imported them see the loaded data.
+bundle_data = {}
+community_bundle_data = {}
 
 
-def get_files_for_project(project_name):
-    """Get the set of files for a learn project"""
-    found_files = set()
-    project_dir = f"{LEARN_GUIDE_REPO}/{project_name}/"
+def load_bundle_data(
+    adafruit_bundle_file=ADAFRUIT_BUNDLE_DATA,
+    community_bundle_file=COMMUNITY_BUNDLE_DATA,
+):
+    """Load the Adafruit and Community bundle data downloaded earlier"""
+    with open(adafruit_bundle_file, "r", encoding="utf-8") as data:
+        bundle_data.clear()
+        bundle_data.update(json.load(data))
 
-    full_tree = os.walk(project_dir)
-    root_level = next(full_tree)
+    with open(community_bundle_file, "r", encoding="utf-8") as data:
+        community_bundle_data.clear()
+        community_bundle_data.update(json.load(data))
 
-    for file in root_level[2]:
+
+def get_dependencies(libraries, bundles=None):
+    """
+    Resolve the packages and single file modules needed by the libraries
+
+    :param libraries: the names of the libraries imported
+    :param bundles: the bundle data to search, in order; by default the
+        Adafruit and then the Community bundle
+    """
+    if bundles is None:
+        bundles = (bundle_data, community_bundle_data)
+    package_list = set()
+    file_list = set()
+
+    libraries_to_check = list(libraries)
+    checked_libraries = set()
+
+    while len(libraries_to_check) > 0:
+        lib_name = libraries_to_check[0]
+        del libraries_to_check[0]
+        if lib_name in checked_libraries:
+            continue
+        checked_libraries.add(lib_name)
+
+        lib_obj = next(
+            (bundle[lib_name] for bundle in bundles if lib_name in bundle), None
+        )
+        if lib_obj is None:
+            # handle lib that is not in any known bundle
+            if "." in lib_name:
+                file_list.add(lib_name)
+            else:
+                package_list.add(lib_name)
+            continue
+
+        # dependencies may come from either bundle, and are added as they
+        # are checked in turn
+        libraries_to_check.extend(lib_obj["dependencies"])
+
+        if lib_obj["package"]:
+            package_list.add(lib_name)
+        else:
+            file_list.add(lib_name + ".mpy")
+
+    return package_list, file_list
+
+
+def sort_libraries(libraries, bundles=None):
+    """Sort the resolved libraries with packages first, as the drive shows them"""
+    package_list, file_list = get_dependencies(libraries, bundles)
+    return sorted(package_list) + sorted(file_list)
+
+
+def _list_directory(path, cached_entry):
+    """
+    List a directory into a tree entry, reusing the cached entry if the
+    directory has not been modified since. Returns None if it is gone.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        if cached_entry is not None and cached_entry["mtime"] == mtime:
+            return cached_entry
+
+        dirs, files, symlinks = [], [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # Like os.walk, directory symlinks are listed but not entered
+                if entry.is_dir():
+                    dirs.append(entry.name)
+                    if entry.is_symlink():
+                        symlinks.append(entry.name)
+                else:
+                    files.append(entry.name)
+    except OSError:
+        return None
+    return {
+        "mtime": mtime,
+        "dirs": sorted(dirs),
+        "files": sorted(files),
+        "symlinks": sorted(symlinks),
+    }
+
+
+def _load_tree_cache(cache_file, root):
+    """Load the cached tree entries for root, or nothing if there are none"""
+    if cache_file is None or not os.path.isfile(cache_file):
+        return {}
+    with open(cache_file, encoding="utf-8") as data:
+        try:
+            cache = json.load(data)
+        except json.decoder.JSONDecodeError as _:
+            print(f"Could not parse {cache_file!r}")
+            return {}
+    if cache.get("root") != os.path.abspath(root):
+        return {}
+    return cache["tree"]
+
+
+def _subdirectories(rel_path, entry):
+    """
+    The paths of the directories to enter below a tree entry. Directory
+    symlinks are not entered, nor hidden directories at the repo root.
+    """
+    return [
+        f"{rel_path}/{name}" if rel_path else name
+        for name in entry["dirs"]
+        if name not in entry["symlinks"] and (rel_path or not name.startswith("."))
+    ]
+
+
+def _walk_tree(root, top, cache):
+    """List top and every directory below it, depth first"""
+    tree = {}
+    pending = [top]
+    while pending:
+        rel_path = pending.pop()
+        entry = _list_directory(os.path.join(root, rel_path), cache.get(rel_path))
+        if entry is None:
+            continue
+        tree[rel_path] = entry
+        pending.extend(_subdirectories(rel_path, entry))
+    return tree
+
+
+def scan_learn_guide_tree(top="", max_workers=None):
+    """
+    List every directory in the learn guide repo, or in one folder of it.
+    Full scans are cached in LEARN_GUIDE_TREE_CACHE, and only directories
+    whose mtime changed are listed again; the cache is only rewritten if
+    something did. Scanning one folder neither reads nor writes the cache.
+    Hidden directories at the top of the repo, like .git, are not entered.
+
+    :param str top: the folder to scan, relative to the repo; all of it by default
+    :param int max_workers: if more than 1, each folder directly below top
+        is listed by one of a pool of this many threads. By default, one
+        per CPU when there is no cache to start from, otherwise 1.
+    :return: dict of directory path relative to the repo ("" for the repo
+        itself) -> {"mtime", "dirs", "files", "symlinks"}
+    """
+    root = LEARN_GUIDE_REPO
+    top = top.strip("/")
+    use_cache = not top and LEARN_GUIDE_TREE_CACHE is not None
+    cache = _load_tree_cache(LEARN_GUIDE_TREE_CACHE, root) if use_cache else {}
+    if max_workers is None:
+        # Threads overlap the reads of directories that are not in the OS
+        # cache. A tree cache means an earlier run, and most likely a warm
+        # OS cache, where the pool only adds overhead.
+        max_workers = 1 if cache else os.cpu_count()
+
+    if max_workers == 1:
+        tree = _walk_tree(root, top, cache)
+    else:
+        top_entry = _list_directory(os.path.join(root, top), cache.get(top))
+        if top_entry is None:
+            return {}
+        tree = {top: top_entry}
+        with ThreadPoolExecutor(max_workers) as executor:
+            for subtree in executor.map(
+                lambda folder: _walk_tree(root, folder, cache),
+                _subdirectories(top, top_entry),
+            ):
+                tree.update(subtree)
+
+    # Unchanged entries are the cached objects themselves
+    if use_cache and (
+        len(tree) != len(cache)
+        or any(entry is not cache.get(rel_path) for rel_path, entry in tree.items())
+    ):
+        with open(LEARN_GUIDE_TREE_CACHE, "w", encoding="utf-8") as data:
+            data.write(json.dumps({"root": os.path.abspath(root), "tree": tree}))
+
+    return tree
+
+
+def get_project_listing(tree, project_name):
+    """
+    Pick the entries of one project out of a scanned tree, with paths
+    relative to the project ("" for the project folder itself).
+    """
+    project_name = project_name.strip("/")
+    listing = {}
+    pending = [""]
+    while pending:
+        rel_path = pending.pop()
+        entry = tree.get(f"{project_name}/{rel_path}" if rel_path else project_name)
+        if entry is None:
+            continue
+        listing[rel_path] = entry
+        pending.extend(
+            f"{rel_path}/{name}" if rel_path else name
+            for name in entry["dirs"]
+            if name not in entry["symlinks"]
+        )
+    return listing
+
+
+def get_files_for_project(project_name, listing=None):
+    """
+    Get the set of files for a learn project
+
+    :param str project_name: the project folder, relative to the learn guide repo
+    :param listing: the project's entries from get_project_listing; the
+        project is scanned if it is not given
+    """
+    if listing is None:
+        listing = get_project_listing(scan_learn_guide_tree(project_name), project_name)
+    found_files = set()
+    root_level = listing[""]
+
+    for file in root_level["files"]:
         if "." in file:
             cur_extension = file.split(".")[-1]
             if cur_extension in SHOWN_FILETYPES:
                 # print(file)
                 found_files.add(file)
 
-    for _dir in root_level[1]:
+    for _dir in root_level["dirs"]:
         dir_tuple = (_dir, tuple())
-        for cur_tuple in os.walk(project_dir):
-            if cur_tuple[0].split("/")[-1] == _dir:
-                for _sub_dir in cur_tuple[1]:
+        # every folder of the project with this name, at any depth
+        for rel_path, entry in listing.items():
+            if rel_path.split("/")[-1] == _dir:
+                for _sub_dir in entry["dirs"]:
                     dir_tuple = (dir_tuple[0], dir_tuple[1] + (_sub_dir,))
-                if len(cur_tuple[2]) < SUBDIRECTORY_FILECOUNT_LIMIT:
-                    for _sub_file in cur_tuple[2]:
+                if len(entry["files"]) < SUBDIRECTORY_FILECOUNT_LIMIT:
+                    for _sub_file in entry["files"]:
                         dir_tuple = (dir_tuple[0], dir_tuple[1] + (_sub_file,))
 
         # e.g. ("dir_name", ("file_1.txt", "file_2.txt"))
@@ -171,20 +398,31 @@ def get_files_for_project(project_name):
     return found_files
 
 
-def get_libs_for_project(project_name):
+def get_imports_for_project(project_name, listing=None):
     # pylint: disable=too-many-nested-blocks
-    """Get the set of libraries for a learn project"""
+    """
+    Get the set of top level names imported by a learn project, whether or
+    not they are in a bundle
+
+    :param str project_name: the project folder, relative to the learn guide repo
+    :param listing: the project's entries from get_project_listing; the
+        project folder is listed if it is not given
+    """
+    import findimports  # pylint: disable=import-outside-toplevel
+
     found_libs = set()
     found_imports = []
     project_dir = f"{LEARN_GUIDE_REPO}{project_name}/"
-    for file in os.listdir(project_dir):
+    if listing is None:
+        project_files = os.listdir(project_dir)
+    else:
+        project_files = listing[""]["files"]
+    for file in project_files:
         if file.endswith(".py"):
 
             found_imports = findimports.find_imports(f"{project_dir}{file}")
             for cur_import in found_imports:
-                cur_lib = cur_import.name.split(".")[0]
-                if cur_lib in bundle_data or cur_lib in community_bundle_data:
-                    found_libs.add(cur_lib)
+                found_libs.add(cur_import.name.split(".")[0])
 
                 # findimports returns import name in the form of "foo.bar.*"
                 if cur_import.name.endswith(".*"):
@@ -195,16 +433,39 @@ def get_libs_for_project(project_name):
                     if os.path.exists(filepath):
                         second_level_imports = findimports.find_imports(filepath)
                         for cur_second_level_import in second_level_imports:
-                            cur_lib = cur_second_level_import.name.split(".")[0]
-                            if (
-                                cur_lib in bundle_data
-                                or cur_lib in community_bundle_data
-                            ):
-                                found_libs.add(cur_lib)
+                            found_libs.add(cur_second_level_import.name.split(".")[0])
 
     return found_libs
 
 
+def filter_bundle_libraries(imports, bundles=None):
+    """
+    Keep the imported names that are libraries in the bundles
+
+    :param imports: the top level names imported
+    :param bundles: the bundle data to look imports up in; by default the
+        Adafruit and then the Community bundle
+    """
+    if bundles is None:
+        bundles = (bundle_data, community_bundle_data)
+    return {name for name in imports if any(name in bundle for bundle in bundles)}
+
+
+def get_libs_for_project(project_name, listing=None, bundles=None):
+    """
+    Get the set of libraries for a learn project
+
+    :param str project_name: the project folder, relative to the learn guide repo
+    :param listing: the project's entries from get_project_listing; the
+        project folder is listed if it is not given
+    :param bundles: the bundle data to look imports up in; by default the
+        Adafruit and then the Community bundle
+    """
+    return filter_bundle_libraries(
+        get_imports_for_project(project_name, listing), bundles
+    )
+
+
 def get_files_for_example(example_path):
     """Get the set of files for a library example"""
     found_files = set(("code.py",))
@@ -240,45 +501,70 @@ def get_files_for_example(example_path):
     return found_files
 
 
-def get_libs_for_example(example_path):
-    """Get the set of libraries for a library example"""
-    found_libs = set()
-    found_imports = []
-    found_imports = findimports.find_imports(example_path)
+def get_libs_for_example(example_path, bundles=None):
+    """
+    Get the set of libraries for a library example
 
-    for cur_import in found_imports:
-        cur_lib = cur_import.name.split(".")[0]
-        if cur_lib in bundle_data:
-            found_libs.add(cur_lib)
+    :param str example_path: the path of the example file
+    :param bundles: the bundle data to look imports up in; by default the
+        Adafruit and then the Community bundle
+    """
+    import findimports  # pylint: disable=import-outside-toplevel
 
-    return found_libs
+    found_imports = findimports.find_imports(example_path)
+    return filter_bundle_libraries(
+        {cur_import.name.split(".")[0] for cur_import in found_imports}, bundles
+    )
 
 
-def get_learn_guide_cp_projects():
-    """Get the list of all circuitpython projects, according to some heuristics"""
-    for dirpath, dirnames, filenames in os.walk(LEARN_GUIDE_REPO):
+def get_learn_guide_cp_projects(tree=None):
+    """
+    Get the list of all circuitpython projects, according to some heuristics
+
+    :param tree: the learn guide repo from scan_learn_guide_tree; it is
+        scanned if not given
+    """
+    if tree is None:
+        tree = scan_learn_guide_tree()
+
+    pending = [""]
+    while pending:
+        dirpath = pending.pop()
+        entry = tree.get(dirpath)
+        if entry is None:
+            continue
+        filenames = entry["files"]
         # Don't consider hidden directories
-        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        dirnames = [
+            d
+            for d in entry["dirs"]
+            if not d.startswith(".") and d not in entry["symlinks"]
+        ]
+        # Reversed so that the sub-folders are popped in alphabetical order
+        subdirs = [f"{dirpath}/{d}" if dirpath else d for d in reversed(dirnames)]
 
         # The top-level needs special treatment
-        if dirpath == LEARN_GUIDE_REPO:
+        if dirpath == "":
+            pending.extend(subdirs)
             continue
 
         # Skip this folder and all subfolders
         if ".circuitpython.skip-screenshot" in filenames:
-            del dirnames[:]
             continue
         # Skip files in this folder, but handle sub-folders
         if ".circuitpython.skip-screenshot-here" in filenames:
+            pending.extend(subdirs)
             continue
         # Do not recurse, but handle files in this folder
-        if ".circuitpython.skip-screenshot-sub" in filenames:
-            del dirnames[:]
+        if ".circuitpython.skip-screenshot-sub" not in filenames:
+            pending.extend(subdirs)
 
         if any(f for f in filenames if f.endswith(".py")):
-            yield os.path.relpath(dirpath, LEARN_GUIDE_REPO)
+            yield dirpath
 
 
 if __name__ == "__main__":
+    ensure_latest_bundles()
+    load_bundle_data()
     for p in get_learn_guide_cp_projects():
         print("PROJECT", p)
@@ -0,0 +1,772 @@
+# SPDX-FileCopyrightText: 2021 foamyguy
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Lay out and render requirement images. Importing this module does no I/O;
+fonts, icons and NumPy are loaded the first time they are needed.
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+from html import escape
+import base64
+import io
+import json
+import os
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from get_imports import SHOWN_FILETYPES, sort_libraries
+from settings_required import settings_required
+from strip_png import StripPNGWriter
+
+OUT_WIDTH = 800
+PADDING = 20
+
+INDENT_SIZE = 28
+LINE_SPACING = 28
+FONT_SIZE = 24
+ICON_SIZE = 24
+TEXT_OFFSET = 30
+HIGHLIGHT_ROW_COLOR = "#404040"
+ROW_COLOR = "#383838"
+
+BACKGROUND_COLOR = "#303030"
+TEXT_COLOR = "#B0B0B0"
+HIDDEN_TEXT_COLOR = "#808080"
+
+
+def asset_path(asset_name):
+    """Return the location of a file shipped with the screenshot maker"""
+    return os.path.join(os.path.dirname(__file__), asset_name)
+
+
+ICON_NAMES = (
+    "right_triangle",
+    "down_triangle",
+    "folder",
+    "folder_hidden",
+    "file",
+    "file_hidden",
+    "file_empty",
+    "file_empty_hidden",
+    "file_image",
+    "file_music",
+    "file_font",
+)
+
+
+@lru_cache(maxsize=None)
+def load_icons():
+    """Load the icons at their native size, once per process"""
+    icons = {}
+    for icon_name in ICON_NAMES:
+        icon = Image.open(asset_path(f"img/{icon_name}.png"))
+        # If this is not done, the images fail to load in the subprocesses.
+        icon.load()
+        icons[icon_name] = icon
+    return icons
+
+
+@lru_cache(maxsize=None)
+def get_numpy():
+    """Import NumPy on first use, or return None if it is not installed"""
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return numpy
+
+
+FILE_TYPE_ICON_MAP = {
+    "py": "file",
+    "mpy": "file",
+    "txt": "file_empty",
+    "md": "file_empty",
+    "toml": "file",
+    "html": "file",
+    "bmp": "file_image",
+    "png": "file_image",
+    "jpg": "file_image",
+    "svg": "file_image",
+    "wav": "file_music",
+    "mp3": "file_music",
+    "mid": "file_music",
+    "pcf": "file_font",
+    "bdf": "file_font",
+    "csv": "file_empty",
+    "json": "file",
+    "license": "file_empty",
+}
+
+# A single line of the rendered CIRCUITPY tree. `indent` is the nesting
+# level, `icon` and `triangle` are ICON_NAMES (or None to leave them out).
+Row = namedtuple("Row", ["name", "indent", "icon", "triangle", "hidden"])
+
+
+def default_icon(name, hidden=False):
+    """Guess the icon for a file or folder from its name alone"""
+    if name.endswith(".mpy") or name.endswith(".py"):
+        icon = "file"
+    elif "." in name[-5:]:
+        icon = "file_empty"
+    else:
+        icon = "folder"
+    return f"{icon}_hidden" if hidden else icon
+
+
+def make_row(name, indent, icon=None, triangle=None, hidden=False):
+    """Create a Row, picking the icon from the name if none is given"""
+    if icon is None:
+        icon = default_icon(name, hidden)
+    return Row(name, indent, icon, triangle, hidden)
+
+
+def filter_custom_project_libs(project_file_set):
+    """
+    Find and remove the custom project lib folder.
+    Returns a tuple with the contents of the custom project lib folder
+    which will in turn get included in the libraries list that the
+    tool uses to generate the "main" lib folder in the screenshot.
+    """
+    _custom_libs = tuple()
+    remove_files = []
+    for file in project_file_set:
+        if not isinstance(file, tuple):
+            continue
+        if file[0] == "lib":
+            _custom_libs = file[1]
+            remove_files.append(file)
+    for file in remove_files:
+        project_file_set.remove(file)
+    return _custom_libs
+
+
+# What a project needs on the drive: its own files, without any lib folder,
+# and every library for lib/ with their dependencies, packages first.
+RequirementSet = namedtuple("RequirementSet", ["project_files", "libraries"])
+
+
+def resolve(project_files, libs, bundles=None):
+    """
+    Resolve the libraries a project needs against the bundles.
+
+    :param project_files: the files of the project, strings for files and
+        ("dir_name", ("file_1.txt", ...)) tuples for directories
+    :param libs: the libraries imported by the project
+    :param bundles: the bundle data dicts to look libraries up in, in order.
+        Defaults to the data loaded by get_imports.load_bundle_data.
+    :return: the RequirementSet of the project
+    """
+    project_files = set(project_files)
+    custom_libs = filter_custom_project_libs(project_files)
+    return RequirementSet(
+        frozenset(project_files),
+        sort_libraries(set(libs) | set(custom_libs), bundles),
+    )
+
+
+def layout(
+    requirements, collapse_threshold=None
+):  # pylint: disable=too-many-locals, too-many-branches
+    """
+    Compute the rows of a requirement image, from CIRCUITPY down to the sd folder.
+
+    :param requirements: the RequirementSet of the project, from resolve
+    :param int collapse_threshold: if set, directories with more entries than
+        this only list that many, followed by a "… N more" row
+    :return: the list of Rows
+    """
+    project_files = set(requirements.project_files)
+    final_list_to_render = requirements.libraries
+
+    project_files.discard("code.py")
+    project_files.discard("main.py")
+
+    # Static files
+    rows = [
+        make_row("CIRCUITPY", 1, triangle="down_triangle"),
+        make_row(".fseventsd", 2, hidden=True, triangle="right_triangle"),
+        make_row(".metadata_never_index", 2, icon="file_empty_hidden", hidden=True),
+        make_row(".Trashes", 2, icon="file_empty_hidden", hidden=True),
+        make_row("boot_out.txt", 2),
+        make_row("code.py", 2, icon="file"),
+    ]
+
+    # Add settings.toml if it's needed
+    if settings_required(final_list_to_render):
+        rows.append(make_row("settings.toml", 2, icon="file"))
+
+    # dynamic files from project dir in learn guide repo
+    project_files_to_draw = []
+    project_folders_to_draw = {}
+    for cur_file in project_files:
+        # string for individual file
+        if isinstance(cur_file, str):
+            if "." in cur_file:
+                cur_extension = cur_file.rsplit(".", 1)[-1]
+                if cur_extension in SHOWN_FILETYPES:
+                    project_files_to_draw.append(cur_file)
+        # tuple for directory
+        elif isinstance(cur_file, tuple):
+            if ".circuitpython.skip-screenshot" not in cur_file[1]:
+                project_folders_to_draw[cur_file[0]] = cur_file[1]
+
+    for file in sorted(project_files_to_draw):
+        cur_file_extension = file.split(".")[-1]
+        rows.append(
+            make_row(
+                file, 2, icon=FILE_TYPE_ICON_MAP.get(cur_file_extension, "file_empty")
+            )
+        )
+
+    for file in sorted(project_folders_to_draw.keys()):
+        sub_files = sorted(project_folders_to_draw[file])
+        rows.append(
+            make_row(
+                file,
+                2,
+                triangle="down_triangle" if sub_files else "right_triangle",
+            )
+        )
+
+        collapsed_count = 0
+        if collapse_threshold is not None and len(sub_files) > collapse_threshold:
+            collapsed_count = len(sub_files) - collapse_threshold
+            sub_files = sub_files[:collapse_threshold]
+
+        for sub_file in sub_files:
+            cur_file_extension = sub_file.split(".")[-1]
+            cur_file_icon = FILE_TYPE_ICON_MAP.get(cur_file_extension, "folder")
+            rows.append(
+                make_row(
+                    sub_file,
+                    3,
+                    icon=cur_file_icon,
+                    triangle="right_triangle" if cur_file_icon == "folder" else None,
+                )
+            )
+
+        if collapsed_count:
+            rows.append(Row(f"… {collapsed_count} more", 3, None, None, True))
+
+    rows.append(make_row("lib", 2, triangle="down_triangle"))
+    for lib_name in final_list_to_render:
+        rows.append(
+            make_row(
+                lib_name,
+                3,
+                triangle=None if lib_name.endswith(".mpy") else "right_triangle",
+            )
+        )
+
+    rows.append(make_row("sd", 2, triangle="right_triangle"))
+
+    return rows
+
+
+def layout_requirement_rows(project_files, libs, collapse_threshold=None, bundles=None):
+    """
+    Resolve and lay out a project in one step.
+
+    :return: tuple of the list of Rows and the resolved library list
+    """
+    requirements = resolve(project_files, libs, bundles)
+    return layout(requirements, collapse_threshold), requirements.libraries
+
+
+# The fonts, icons and dimensions used to render at a given scale factor
+RenderAssets = namedtuple(
+    "RenderAssets",
+    [
+        "scale",
+        "width",
+        "padding",
+        "indent_size",
+        "line_spacing",
+        "icon_size",
+        "text_offset",
+        "font",
+        "icons",
+    ],
+)
+
+
+@lru_cache(maxsize=None)
+def get_render_assets(scale=1):
+    """
+    Get the assets for rendering at an integer scale factor. The font and
+    icons are loaded, and resampled, the first time a scale is used in each
+    process and reused afterwards.
+    """
+    scaled_font = ImageFont.truetype(
+        asset_path("Roboto-Regular.ttf"), FONT_SIZE * scale
+    )
+    scaled_icons = load_icons()
+    if scale != 1:
+        scaled_icons = {
+            icon_name: icon.resize(
+                (ICON_SIZE * scale, ICON_SIZE * scale), Image.Resampling.LANCZOS
+            )
+            for icon_name, icon in scaled_icons.items()
+        }
+    return RenderAssets(
+        scale,
+        OUT_WIDTH * scale,
+        PADDING * scale,
+        INDENT_SIZE * scale,
+        LINE_SPACING * scale,
+        ICON_SIZE * scale,
+        TEXT_OFFSET * scale,
+        scaled_font,
+        scaled_icons,
+    )
+
+
+def image_height(rows, scale=1):
+    """The height in pixels of an image showing the given rows"""
+    return (PADDING * 2 + len(rows) * LINE_SPACING) * scale
+
+
+def render_rows(rows, top=0, height=None, scale=1):  # pylint: disable=too-many-locals
+    """
+    Render a horizontal band of a requirement image.
+
+    :param rows: the Rows of the image, as returned by layout_requirement_rows
+    :param int top: the first pixel row of the band
+    :param int height: the height of the band, defaults to the rest of the image
+    :param int scale: the scale factor to render at
+    :return: the RGB image of the band
+    """
+    assets = get_render_assets(scale)
+    if height is None:
+        height = image_height(rows, scale) - top
+
+    img = Image.new("RGB", (assets.width, height), BACKGROUND_COLOR)
+    draw = ImageDraw.Draw(img)
+
+    # Only rows touching the band are drawn; one extra row either side
+    # catches glyphs that overhang their own row.
+    first_row = max(0, (top - assets.padding) // assets.line_spacing - 1)
+    last_row = min(
+        len(rows), (top + height - assets.padding) // assets.line_spacing + 2
+    )
+
+    for i in range(first_row, last_row):
+        row_y = assets.padding + i * assets.line_spacing - top
+        draw.rectangle(
+            [
+                (assets.padding, row_y),
+                (assets.width - assets.padding, row_y + assets.line_spacing),
+            ],
+            fill=HIGHLIGHT_ROW_COLOR if i % 2 == 0 else ROW_COLOR,
+        )
+
+    for i in range(first_row, last_row):
+        row = rows[i]
+        row_x = assets.padding + assets.indent_size * row.indent
+        row_y = assets.padding + i * assets.line_spacing - top
+        icon_y = row_y + (assets.line_spacing - assets.icon_size) // 2
+        if row.triangle:
+            triangle_icon = assets.icons[row.triangle]
+            img.paste(
+                triangle_icon, (row_x - assets.icon_size, icon_y), mask=triangle_icon
+            )
+        if row.icon:
+            icon = assets.icons[row.icon]
+            img.paste(icon, (row_x, icon_y), mask=icon)
+        draw.text(
+            (row_x + assets.text_offset, row_y + assets.line_spacing // 2),
+            row.name,
+            fill=HIDDEN_TEXT_COLOR if row.hidden else TEXT_COLOR,
+            anchor="lm",
+            font=assets.font,
+        )
+
+    return img
+
+
+def blend_into(canvas, position, sprite):
+    """
+    Blend a sprite into part of a canvas array, clipped to the canvas.
+    Rounds exactly like Pillow's paste and text drawing, so both engines
+    produce identical pixels.
+
+    :param canvas: the HxWx3 uint8 array to draw on
+    :param position: the (x, y) of the top left corner of the sprite
+    :param sprite: the (inverse alpha, premultiplied color) uint16 arrays of
+        a sprite, as made by make_sprite
+    """
+    inverse_alpha, premultiplied = sprite
+    x, y = position
+    left, top = max(x, 0), max(y, 0)
+    right = min(x + inverse_alpha.shape[1], canvas.shape[1])
+    bottom = min(y + inverse_alpha.shape[0], canvas.shape[0])
+    if left >= right or top >= bottom:
+        return
+
+    sprite_area = (slice(top - y, bottom - y), slice(left - x, right - x))
+    region = canvas[top:bottom, left:right]
+    # Never exceeds 255 * 255 + 128 + 254, so uint16 is enough
+    blended = region * inverse_alpha[sprite_area]
+    blended += premultiplied[sprite_area]
+    blended += blended >> 8
+    blended >>= 8
+    region[...] = blended
+
+
+def make_sprite(color, alpha):
+    """
+    Precompute the terms of Pillow's blend for a color, or an RGB array of
+    the alpha mask's size, so that blending only needs a multiply and add.
+    """
+    np = get_numpy()
+    alpha = alpha.astype(np.uint16)[..., None]
+    return 255 - alpha, (color * alpha + 128).astype(np.uint16)
+
+
+@lru_cache(maxsize=None)
+def get_icon_sprite(icon_name, scale=1):
+    """An icon at the given scale, as a sprite"""
+    np = get_numpy()
+    pixels = np.asarray(get_render_assets(scale).icons[icon_name].convert("RGBA"))
+    return make_sprite(pixels[..., :3].astype(np.uint16), pixels[..., 3])
+
+
+@lru_cache(maxsize=512)
+def get_text_sprite(text, color, scale=1):
+    """
+    Rasterize a row's text once per process, color and scale. Returns the
+    sprite and its offset from the text's left-middle anchor, or None if the
+    text has no visible pixels.
+    """
+    np = get_numpy()
+    assets = get_render_assets(scale)
+    left, top, right, bottom = assets.font.getbbox(text, anchor="lm")
+    margin = assets.font.size
+    mask = Image.new("L", (right - left + margin * 2, bottom - top + margin * 2))
+    ImageDraw.Draw(mask).text(
+        (margin - left, margin - top), text, fill=255, anchor="lm", font=assets.font
+    )
+    box = mask.getbbox()
+    if box is None:
+        return None
+    return (
+        make_sprite(
+            np.array(ImageColor.getrgb(color), np.uint16),
+            np.asarray(mask.crop(box)),
+        ),
+        box[0] - margin + left,
+        box[1] - margin + top,
+    )
+
+
+def render_rows_numpy(
+    rows, top=0, height=None, scale=1
+):  # pylint: disable=too-many-locals
+    """
+    Render a horizontal band of a requirement image like render_rows, but
+    composite the background, icons and cached text sprites with NumPy.
+    """
+    np = get_numpy()
+    assets = get_render_assets(scale)
+    if height is None:
+        height = image_height(rows, scale) - top
+
+    # Every pixel row is a copy of one of three scanlines: the padding, or
+    # a highlighted or plain row.
+    scanlines = np.empty((3, assets.width, 3), np.uint8)
+    scanlines[:] = ImageColor.getrgb(BACKGROUND_COLOR)
+    row_area = slice(assets.padding, assets.width - assets.padding + 1)
+    scanlines[1, row_area] = ImageColor.getrgb(HIGHLIGHT_ROW_COLOR)
+    scanlines[2, row_area] = ImageColor.getrgb(ROW_COLOR)
+
+    # Each row's rectangle covers one pixel of the next, which draws over
+    # it; only the last row keeps its bottom edge.
+    pixel_y = np.arange(top, top + height)
+    row_index = np.minimum(
+        (pixel_y - assets.padding) // assets.line_spacing, len(rows) - 1
+    )
+    scanline_index = np.where(row_index % 2 == 0, 1, 2)
+    # pylint: disable-next=unsupported-assignment-operation
+    scanline_index[
+        (pixel_y < assets.padding)
+        | (pixel_y > assets.padding + len(rows) * assets.line_spacing)
+    ] = 0
+    canvas = scanlines[scanline_index]
+
+    first_row = max(0, (top - assets.padding) // assets.line_spacing - 1)
+    last_row = min(
+        len(rows), (top + height - assets.padding) // assets.line_spacing + 2
+    )
+    for i in range(first_row, last_row):
+        row = rows[i]
+        row_x = assets.padding + assets.indent_size * row.indent
+        row_y = assets.padding + i * assets.line_spacing - top
+        icon_y = row_y + (assets.line_spacing - assets.icon_size) // 2
+        if row.triangle:
+            blend_into(
+                canvas,
+                (row_x - assets.icon_size, icon_y),
+                get_icon_sprite(row.triangle, scale),
+            )
+        if row.icon:
+            blend_into(canvas, (row_x, icon_y), get_icon_sprite(row.icon, scale))
+        text_sprite = get_text_sprite(
+            row.name, HIDDEN_TEXT_COLOR if row.hidden else TEXT_COLOR, scale
+        )
+        if text_sprite is not None:
+            sprite, offset_x, offset_y = text_sprite
+            blend_into(
+                canvas,
+                (
+                    row_x + assets.text_offset + offset_x,
+                    row_y + assets.line_spacing // 2 + offset_y,
+                ),
+                sprite,
+            )
+
+    return Image.fromarray(canvas)
+
+
+# Compositing engine name -> function rendering a band of rows
+RENDER_ENGINES = {
+    "pillow": render_rows,
+    "numpy": render_rows_numpy,
+}
+
+
+def get_available_engine(engine="pillow"):
+    """The name of the engine that will render, Pillow if NumPy is missing"""
+    if engine == "numpy" and get_numpy() is None:
+        return "pillow"
+    return engine
+
+
+def get_render_engine(engine="pillow"):
+    """Look up a compositing engine, falling back to Pillow without NumPy"""
+    return RENDER_ENGINES[get_available_engine(engine)]
+
+
+@contextmanager
+def open_output(path, binary=False):
+    """Open a path for writing, or use an already open file object as is"""
+    if hasattr(path, "write"):
+        yield path
+    elif binary:
+        with open(path, "wb") as out_file:
+            yield out_file
+    else:
+        with open(path, "w", encoding="utf-8") as out_file:
+            yield out_file
+
+
+def write_text_output(path, text):
+    """Write text to a path, a text file or a binary file (as UTF-8)"""
+    with open_output(path) as out_file:
+        if isinstance(out_file, io.TextIOBase):
+            out_file.write(text)
+        else:
+            out_file.write(text.encode("utf-8"))
+
+
+def save_requirement_image(
+    rows, path, scale=1, memory_budget=None, engine="pillow"
+):  # pylint: disable=too-many-arguments
+    """
+    Render the rows and save them as a PNG.
+
+    :param rows: the Rows of the image
+    :param path: where to write the PNG, a path or a binary file object
+    :param int scale: the scale factor to render at
+    :param int memory_budget: if set, the maximum size in bytes of the canvas.
+        Taller images are rendered in strips and streamed to the file.
+    :param str engine: the name of the compositing engine to render with
+    """
+    render_function = get_render_engine(engine)
+    width = OUT_WIDTH * scale
+    height = image_height(rows, scale)
+    row_bytes = width * 3
+    if memory_budget is None or height * row_bytes <= memory_budget:
+        render_function(rows, scale=scale).save(path, "PNG")
+        return
+
+    strip_height = max(1, memory_budget // row_bytes)
+    with open_output(path, binary=True) as out_file:
+        writer = StripPNGWriter(out_file, width, height)
+        for top in range(0, height, strip_height):
+            writer.write_strip(
+                render_function(rows, top, min(strip_height, height - top), scale)
+            )
+        writer.close()
+
+
+def save_webp_image(rows, path, scale=1, engine="pillow"):
+    """
+    Render the rows and save them as a lossless WebP. The image is always
+    rendered in one piece; only PNG output can be streamed in strips.
+    """
+    get_render_engine(engine)(rows, scale=scale).save(path, "WEBP", lossless=True)
+
+
+@lru_cache(maxsize=None)
+def icon_data_uri(icon_name):
+    """The PNG of an icon, encoded as a data URI for embedding in SVG"""
+    # Re-encoding drops the colour profile and other metadata of the assets
+    icon_png = io.BytesIO()
+    load_icons()[icon_name].save(icon_png, "PNG", optimize=True)
+    encoded = base64.b64encode(icon_png.getvalue()).decode("ascii")
+    return f"data:image/png;base64,{encoded}"
+
+
+def save_svg_image(rows, path, scale=1):
+    """
+    Save the rows as an SVG. Each icon used is embedded once as a symbol
+    and referenced from every row that shows it. The drawing itself is
+    always laid out at 1x; `scale` only changes the intrinsic size.
+    """
+    height = image_height(rows)
+    used_icons = sorted(
+        {row.icon for row in rows if row.icon}
+        | {row.triangle for row in rows if row.triangle}
+    )
+
+    lines = [
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        'xmlns:xlink="http://www.w3.org/1999/xlink" '
+        f'width="{OUT_WIDTH * scale}" height="{height * scale}" '
+        f'viewBox="0 0 {OUT_WIDTH} {height}">',
+        "<defs>",
+    ]
+    for icon_name in used_icons:
+        lines.append(
+            f'<symbol id="{icon_name}" viewBox="0 0 {ICON_SIZE} {ICON_SIZE}">'
+            f'<image width="{ICON_SIZE}" height="{ICON_SIZE}" '
+            f'xlink:href="{icon_data_uri(icon_name)}"/>'
+            "</symbol>"
+        )
+    lines.append("</defs>")
+    lines.append(
+        f'<rect width="{OUT_WIDTH}" height="{height}" fill="{BACKGROUND_COLOR}"/>'
+    )
+
+    for i in range(len(rows)):
+        lines.append(
+            f'<rect x="{PADDING}" y="{PADDING + i * LINE_SPACING}" '
+            f'width="{OUT_WIDTH - PADDING * 2}" height="{LINE_SPACING}" '
+            f'fill="{HIGHLIGHT_ROW_COLOR if i % 2 == 0 else ROW_COLOR}"/>'
+        )
+
+    lines.append(f'<g font-family="Roboto, sans-serif" font-size="{FONT_SIZE}">')
+    for i, row in enumerate(rows):
+        row_x = PADDING + INDENT_SIZE * row.indent
+        row_y = PADDING + i * LINE_SPACING
+        icon_y = row_y + (LINE_SPACING - ICON_SIZE) // 2
+        if row.triangle:
+            lines.append(
+                f'<use xlink:href="#{row.triangle}" x="{row_x - ICON_SIZE}" '
+                f'y="{icon_y}" width="{ICON_SIZE}" height="{ICON_SIZE}"/>'
+            )
+        if row.icon:
+            lines.append(
+                f'<use xlink:href="#{row.icon}" x="{row_x}" y="{icon_y}" '
+                f'width="{ICON_SIZE}" height="{ICON_SIZE}"/>'
+            )
+        lines.append(
+            f'<text x="{row_x + TEXT_OFFSET}" y="{row_y + LINE_SPACING // 2}" '
+            f'fill="{HIDDEN_TEXT_COLOR if row.hidden else TEXT_COLOR}" '
+            f'dominant-baseline="central">{escape(row.name, quote=False)}</text>'
+        )
+    lines.append("</g>")
+    lines.append("</svg>")
+
+    write_text_output(path, "\n".join(lines) + "\n")
+
+
+def rows_to_tree(rows):
+    """
+    Nest the rows into a tree of dicts, one per file or folder, following
+    their indentation. Returns the CIRCUITPY node.
+    """
+    root = {"children": []}
+    parents = [(0, root)]
+    for row in rows:
+        if row.icon is None:
+            node_type = "more"
+        elif row.triangle or row.icon.startswith("folder"):
+            node_type = "folder"
+        else:
+            node_type = "file"
+        node = {
+            "name": row.name,
+            "type": node_type,
+            "icon": row.icon,
+            "hidden": row.hidden,
+        }
+        if node_type == "folder":
+            node["children"] = []
+
+        while parents[-1][0] >= row.indent:
+            parents.pop()
+        parents[-1][1]["children"].append(node)
+        if node_type == "folder":
+            parents.append((row.indent, node))
+    return root["children"][0]
+
+
+def save_json_tree(rows, path):
+    """Save the rows as a JSON tree of the CIRCUITPY drive"""
+    write_text_output(
+        path, json.dumps(rows_to_tree(rows), indent=2, ensure_ascii=False) + "\n"
+    )
+
+
+def format_text_tree(node, prefix=""):
+    """Yield the lines of a `tree` style listing of a node's children"""
+    children = node.get("children", [])
+    for i, child in enumerate(children):
+        last = i == len(children) - 1
+        name = child["name"] + ("/" if child["type"] == "folder" else "")
+        yield f"{prefix}{'└── ' if last else '├── '}{name}"
+        yield from format_text_tree(child, prefix + ("    " if last else "│   "))
+
+
+def save_text_tree(rows, path):
+    """Save the rows as a plain text tree of the CIRCUITPY drive"""
+    tree = rows_to_tree(rows)
+    lines = [f"{tree['name']}/", *format_text_tree(tree)]
+    write_text_output(path, "\n".join(lines) + "\n")
+
+
+# Output format name -> (file extension, function saving rows to a path or file)
+OUTPUT_FORMATS = {
+    "png": ("png", save_requirement_image),
+    "webp": ("webp", save_webp_image),
+    "svg": ("svg", save_svg_image),
+    "json": ("json", save_json_tree),
+    "txt": ("txt", save_text_tree),
+}
+
+# Formats with a pixel size, written once per scale factor
+SCALED_FORMATS = ("png", "webp", "svg")
+
+
+def render(rows, sink, output_format="png", scale=1, **options):
+    """
+    Write the rows of a layout in one of the OUTPUT_FORMATS.
+
+    :param rows: the Rows to draw, as returned by layout
+    :param sink: a path, or a file object open for writing. PNG and WebP
+        need a binary file; the other formats take text or binary files.
+    :param str output_format: the name of the format to write
+    :param int scale: the scale factor of the SCALED_FORMATS
+    :param options: further options of the format, memory_budget and engine
+        for PNG or engine for WebP
+    """
+    save_function = OUTPUT_FORMATS[output_format][1]
+    if output_format in SCALED_FORMATS:
+        save_function(rows, sink, scale, **options)
+    else:
+        save_function(rows, sink, **options)
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Write RGB PNG files a horizontal strip at a time, so that the full
+image never has to be held in memory.
+"""
+
+import struct
+import zlib
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _chunk(chunk_type, data):
+    """Encode a single PNG chunk"""
+    return (
+        struct.pack(">I", len(data))
+        + chunk_type
+        + data
+        + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF)
+    )
+
+
+class StripPNGWriter:
+    """
+    Stream an 8-bit RGB PNG to an open binary file.
+
+    The header is written immediately; call `write_strip` with PIL images
+    of the full width, top to bottom, then `close` once `height` rows have
+    been written.
+
+    :param file: a binary file object to write to
+    :param int width: the width of the image in pixels
+    :param int height: the total height of the image in pixels
+    :param int compress_level: zlib compression level
+    :param int chunk_size: size of the compressed data kept before an IDAT
+        chunk is flushed to the file
+    """
+
+    def __init__(
+        self, file, width, height, compress_level=6, chunk_size=64 * 1024
+    ):  # pylint: disable=too-many-arguments
+        self.file = file
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(compress_level)
+        self._pending = b""
+
+        file.write(PNG_SIGNATURE)
+        file.write(
+            _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        )
+
+    def write_strip(self, strip):
+        """Append the rows of an RGB image to the PNG"""
+        if strip.mode != "RGB" or strip.width != self.width:
+            raise ValueError(f"Strip must be an RGB image {self.width} pixels wide")
+        if self.rows_written + strip.height > self.height:
+            raise ValueError("Strip extends past the end of the image")
+
+        data = strip.tobytes()
+        stride = self.width * 3
+        # Every scanline is prefixed with its filter type, 0 meaning none
+        scanlines = b"".join(
+            b"\x00" + data[offset : offset + stride]
+            for offset in range(0, len(data), stride)
+        )
+        self._pending += self._compressor.compress(scanlines)
+        self.rows_written += strip.height
+        if len(self._pending) >= self.chunk_size:
+            self.file.write(_chunk(b"IDAT", self._pending))
+            self._pending = b""
+
+    def close(self):
+        """Finish the compressed stream and write the trailing chunks"""
+        if self.rows_written != self.height:
+            raise ValueError(
+                f"Only {self.rows_written} of {self.height} rows were written"
+            )
+        self._pending += self._compressor.flush()
+        self.file.write(_chunk(b"IDAT", self._pending))
+        self._pending = b""
+        self.file.write(_chunk(b"IEND", b""))
@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Shared fixtures for the screenshot maker tests
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+from PIL import Image
+
+import get_imports
+from get_imports import get_files_for_project, get_libs_for_project
+from requirement_images import layout_requirement_rows
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+# LEARN_GUIDE_REPO must end with a trailing slash
+GUIDES_DIR = os.path.join(FIXTURES_DIR, "guides", "")
+
+
+def pytest_addoption(parser):
+    """Add the option to regenerate the golden files"""
+    parser.addoption(
+        "--update-golden",
+        action="store_true",
+        help="Rewrite the golden files from the current output instead of comparing",
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fixture_bundle_data():
+    """Use the small fixture bundles instead of the downloaded ones"""
+    get_imports.load_bundle_data(
+        os.path.join(FIXTURES_DIR, "bundle_data.json"),
+        os.path.join(FIXTURES_DIR, "community_bundle_data.json"),
+    )
+
+
+@pytest.fixture
+def guides_repo(monkeypatch, tmp_path):
+    """
+    Point the project discovery at a copy of the fixture guides tree, which
+    the tests can modify. Python caches from compiling the tree are left out.
+    """
+    guides_dir = tmp_path / "guides"
+    shutil.copytree(
+        GUIDES_DIR, guides_dir, ignore=shutil.ignore_patterns("__pycache__")
+    )
+    monkeypatch.setattr(get_imports, "LEARN_GUIDE_REPO", f"{guides_dir}/")
+    monkeypatch.setattr(
+        get_imports, "LEARN_GUIDE_TREE_CACHE", str(tmp_path / "tree_cache.json")
+    )
+    return guides_dir
+
+
+@pytest.fixture
+def run_dir(monkeypatch, tmp_path):
+    """Run in an empty directory holding the fixture bundle data"""
+    monkeypatch.chdir(tmp_path)
+    shutil.copyfile(
+        os.path.join(FIXTURES_DIR, "bundle_data.json"),
+        get_imports.ADAFRUIT_BUNDLE_DATA,
+    )
+    shutil.copyfile(
+        os.path.join(FIXTURES_DIR, "community_bundle_data.json"),
+        get_imports.COMMUNITY_BUNDLE_DATA,
+    )
+    return tmp_path
+
+
+def project_rows(project, **kwargs):
+    """Lay out the rows of a fixture project, as the learn command would"""
+    rows, _ = layout_requirement_rows(
+        get_files_for_project(project), get_libs_for_project(project), **kwargs
+    )
+    return rows
+
+
+class Golden:
+    """Load golden files, or write them when run with --update-golden"""
+
+    def __init__(self, update):
+        self.update = update
+
+    def json(self, name, data):
+        """Return the golden JSON for name, after writing data to it if updating"""
+        path = os.path.join(GOLDEN_DIR, f"{name}.json")
+        if self.update:
+            with open(path, "w", encoding="utf-8") as golden_file:
+                json.dump(data, golden_file, indent=2, ensure_ascii=False)
+                golden_file.write("\n")
+        with open(path, encoding="utf-8") as golden_file:
+            return json.load(golden_file)
+
+    def image(self, name, image):
+        """Return the golden PNG for name, after saving image to it if updating"""
+        path = os.path.join(GOLDEN_DIR, f"{name}.png")
+        if self.update:
+            image.save(path)
+        golden_image = Image.open(path)
+        golden_image.load()
+        return golden_image
+
+
+@pytest.fixture
+def golden(request):
+    """Access to the golden files"""
+    return Golden(request.config.getoption("--update-golden"))
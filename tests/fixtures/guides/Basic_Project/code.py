@@ -0,0 +1,8 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import time
+import board
+import neopixel
+from adafruit_display_text import label
@@ -0,0 +1,6 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import custom_driver
+import adafruit_display_text
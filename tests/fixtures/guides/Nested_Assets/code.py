@@ -0,0 +1,6 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+from adafruit_bitmap_font import bitmap_font
+from helpers import *
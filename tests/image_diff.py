@@ -0,0 +1,49 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Fast array based comparison of rendered images
+"""
+
+import numpy as np
+
+
+def image_difference(expected, actual, threshold=0):
+    """
+    Compare two images of the same size pixel by pixel.
+
+    :param expected: the reference PIL image
+    :param actual: the PIL image to check
+    :param int threshold: the largest difference in any channel that still
+        counts as equal, to allow for small anti-aliasing changes
+    :return: tuple of the fraction of pixels that differ and a list of
+        (left, top, right, bottom) boxes around each horizontal band of
+        differing pixels
+    """
+    if expected.size != actual.size:
+        raise ValueError(f"Image sizes differ: {expected.size} != {actual.size}")
+
+    expected_pixels = np.asarray(expected.convert("RGB"), np.int16)
+    actual_pixels = np.asarray(actual.convert("RGB"), np.int16)
+    differs = np.abs(expected_pixels - actual_pixels).max(axis=2) > threshold
+
+    regions = []
+    differing_rows = np.flatnonzero(differs.any(axis=1))
+    if differing_rows.size:
+        bands = np.split(
+            differing_rows, np.flatnonzero(np.diff(differing_rows) > 1) + 1
+        )
+        for band in bands:
+            top, bottom = int(band[0]), int(band[-1]) + 1
+            differing_columns = np.flatnonzero(differs[top:bottom].any(axis=0))
+            regions.append(
+                (
+                    int(differing_columns[0]),
+                    top,
+                    int(differing_columns[-1]) + 1,
+                    bottom,
+                )
+            )
+
+    return float(differs.mean()), regions
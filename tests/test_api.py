@@ -0,0 +1,193 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests for using the layout and rendering functions as a library
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+from PIL import Image, ImageChops
+
+import get_imports
+import requirement_images
+from create_requirement_images import (
+    generate_example_requirement_image,
+    generate_learn_requirement_image,
+    generate_requirement_image,
+    get_render_kwargs,
+)
+from requirement_images import (
+    OUT_WIDTH,
+    image_height,
+    layout,
+    make_row,
+    render,
+    render_rows,
+    resolve,
+)
+
+SVG_NAMESPACE = "{http://www.w3.org/2000/svg}"
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_is_side_effect_free(tmp_path):
+    """Importing writes no files and leaves the slow dependencies unloaded"""
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import json, sys; import create_requirement_images; "
+            "print(json.dumps(sorted(set(sys.modules) & "
+            "{'numpy', 'requests', 'findimports'})))",
+        ],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": REPO_DIR},
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    assert not json.loads(loaded)
+    assert not os.listdir(tmp_path)
+
+
+def test_injected_bundles():
+    """Libraries are resolved against the bundles given, not the loaded ones"""
+    bundles = (
+        {
+            "adafruit_display_text": {
+                "package": True,
+                "dependencies": ["adafruit_ticks"],
+            },
+            "adafruit_ticks": {"package": False, "dependencies": []},
+        },
+    )
+    requirements = resolve(
+        ["code.py", ("lib", ("custom.mpy",))], {"adafruit_display_text"}, bundles
+    )
+    assert requirements.project_files == {"code.py"}
+    assert requirements.libraries == [
+        "adafruit_display_text",
+        "adafruit_ticks.mpy",
+        "custom.mpy",
+    ]
+
+
+def test_injected_bundles_discovery(monkeypatch, tmp_path, guides_repo):
+    """Imports are looked up in the bundles given, without loading any"""
+    bundles = (dict(get_imports.bundle_data), dict(get_imports.community_bundle_data))
+    monkeypatch.setattr(get_imports, "bundle_data", {})
+    monkeypatch.setattr(get_imports, "community_bundle_data", {})
+    output_dir = tmp_path / "images"
+    render_kwargs = {"formats": ("txt",), "output_dir": str(output_dir)}
+
+    imports = generate_learn_requirement_image(
+        "Basic_Project", bundles=bundles, **render_kwargs
+    )
+    assert imports == {"adafruit_display_text", "board", "neopixel", "time"}
+    listing = (output_dir / "Basic_Project.txt").read_text(encoding="utf-8")
+    assert "adafruit_bitmap_font" in listing
+
+    example_path = guides_repo / "Basic_Project" / "code.py"
+    generate_example_requirement_image(
+        str(example_path), bundles=bundles, **render_kwargs
+    )
+    (example_listing,) = set(os.listdir(output_dir)) - {"Basic_Project.txt"}
+    listing = (output_dir / example_listing).read_text(encoding="utf-8")
+    assert "neopixel.mpy" in listing
+
+
+def test_render_to_file_objects():
+    """Every format can be written to an open file instead of a path"""
+    rows = layout(resolve(["code.py", "data.txt"], {"neopixel"}))
+
+    png = io.BytesIO()
+    render(rows, png, "png", scale=2)
+    png.seek(0)
+    assert Image.open(png).size == (OUT_WIDTH * 2, image_height(rows, 2))
+
+    tree = io.BytesIO()
+    render(rows, tree, "json")
+    assert json.loads(tree.getvalue())["name"] == "CIRCUITPY"
+
+    text = io.StringIO()
+    render(rows, text, "txt")
+    assert "data.txt" in text.getvalue()
+
+
+def test_svg_output():
+    """Each icon is embedded once and used by reference, and names are escaped"""
+    rows = layout(resolve(["code.py", "song.mp3", "logo.bmp"], {"neopixel"}))
+    rows.append(make_row("R&D <draft>.txt", 3))
+    svg = io.BytesIO()
+    render(rows, svg, "svg")
+
+    assert b"R&amp;D &lt;draft&gt;.txt" in svg.getvalue()
+    root = ET.fromstring(svg.getvalue())
+    symbol_ids = [symbol.get("id") for symbol in root.iter(f"{SVG_NAMESPACE}symbol")]
+    used_icons = {row.icon for row in rows} | {row.triangle for row in rows}
+    assert sorted(symbol_ids) == sorted(used_icons - {None})
+    assert {use.get(XLINK_HREF) for use in root.iter(f"{SVG_NAMESPACE}use")} == {
+        f"#{symbol_id}" for symbol_id in symbol_ids
+    }
+    texts = [text.text for text in root.iter(f"{SVG_NAMESPACE}text")]
+    assert texts == [row.name for row in rows]
+
+
+def test_webp_is_lossless():
+    """WebP output decodes to exactly the pixels Pillow rendered"""
+    rows = layout(resolve(["code.py", "data.txt"], {"neopixel"}))
+    for scale in (1, 2):
+        webp = io.BytesIO()
+        render(rows, webp, "webp", scale=scale)
+        webp.seek(0)
+        with Image.open(webp) as image:
+            assert image.format == "WEBP"
+            decoded = image.convert("RGB")
+        assert (
+            ImageChops.difference(decoded, render_rows(rows, scale=scale)).getbbox()
+            is None
+        )
+
+
+def test_output_dir(tmp_path):
+    """Images are written to the requested directory, which is created"""
+    output_dir = tmp_path / "images"
+    generate_requirement_image(
+        ["code.py"],
+        {"neopixel"},
+        "Project",
+        formats=("png", "txt"),
+        output_dir=str(output_dir),
+    )
+    assert sorted(os.listdir(output_dir)) == ["Project.png", "Project.txt"]
+
+
+def test_engine_fallback_warns_once(monkeypatch, capsys, tmp_path):
+    """Without NumPy the fallback is reported once, not for every image"""
+    monkeypatch.setattr(requirement_images, "get_numpy", lambda: None)
+    render_kwargs = get_render_kwargs(
+        ("png", "webp"), (1, 2), None, None, "numpy", str(tmp_path)
+    )
+    assert render_kwargs["engine"] == "pillow"
+    assert capsys.readouterr().out.count("NumPy is not installed") == 1
+
+    rows = layout(resolve(["code.py"], {"neopixel"}))
+    render(rows, io.BytesIO(), "png", engine="numpy")
+    assert "NumPy" not in capsys.readouterr().out
+
+
+def test_webp_budget_warning(capsys, tmp_path):
+    """A memory budget with WebP output warns that it is not applied"""
+    get_render_kwargs(("png",), (1,), 4, None, "pillow", str(tmp_path))
+    assert not capsys.readouterr().out
+    get_render_kwargs(("png", "webp"), (1,), 4, None, "pillow", str(tmp_path))
+    assert "only applies to PNG" in capsys.readouterr().out
@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests for finding the guides affected by a bundle update
+"""
+
+import json
+import os
+
+import pytest
+
+import get_imports
+from bundle_diff import (
+    GUIDE_IMPORTS,
+    get_affected_guides,
+    get_changed_libraries,
+    get_record_dir,
+    save_render_record,
+)
+
+RECORD_DIR = get_record_dir("generated_images")
+
+
+def test_changes_are_transitive():
+    """A new dependency changes every library that depends on it"""
+    old_bundles = (dict(get_imports.bundle_data), {})
+    new_bundles = (dict(get_imports.bundle_data), {})
+    new_bundles[0]["adafruit_bitmap_font"] = {
+        "package": True,
+        "dependencies": ["adafruit_ticks"],
+    }
+    new_bundles[0]["adafruit_ticks"] = {"package": False, "dependencies": []}
+
+    assert get_changed_libraries(old_bundles[0].keys(), old_bundles, new_bundles) == {
+        "adafruit_bitmap_font",
+        "adafruit_display_text",
+    }
+
+
+def test_removed_library_changes():
+    """A library leaving the bundles changes, even without dependencies"""
+    old_bundles = (dict(get_imports.bundle_data), {})
+    new_bundles = (dict(get_imports.bundle_data), {})
+    del new_bundles[0]["adafruit_bitmap_font"]
+
+    assert get_changed_libraries(
+        ["adafruit_bitmap_font"], old_bundles, new_bundles
+    ) == {"adafruit_bitmap_font"}
+    assert get_changed_libraries(
+        ["adafruit_bitmap_font"], new_bundles, old_bundles
+    ) == {"adafruit_bitmap_font"}
+
+
+@pytest.mark.usefixtures("run_dir")
+def test_affected_guides(monkeypatch):
+    """Only the guides using a changed library are affected"""
+    guides = ["Basic_Project", "Settings_Project"]
+    assert get_affected_guides(guides, RECORD_DIR) is None
+
+    save_render_record(
+        {
+            "Basic_Project": {"adafruit_display_text", "board", "neopixel"},
+            "Settings_Project": {"adafruit_requests", "adafruit_ticks"},
+        },
+        RECORD_DIR,
+    )
+    assert not get_affected_guides(guides, RECORD_DIR)
+
+    monkeypatch.setitem(
+        get_imports.bundle_data,
+        "adafruit_pixelbuf",
+        {"package": True, "dependencies": []},
+    )
+    assert get_affected_guides(guides, RECORD_DIR) == ["Basic_Project"]
+
+
+@pytest.mark.usefixtures("run_dir")
+def test_joined_library(monkeypatch):
+    """Guides importing a library that joined the bundles are affected"""
+    guides = ["Basic_Project", "Settings_Project"]
+    save_render_record(
+        {
+            "Basic_Project": {"adafruit_display_text", "board", "neopixel"},
+            "Settings_Project": {"adafruit_requests", "adafruit_ticks"},
+        },
+        RECORD_DIR,
+    )
+    monkeypatch.setitem(
+        get_imports.bundle_data,
+        "adafruit_ticks",
+        {"package": False, "dependencies": []},
+    )
+    assert get_affected_guides(guides, RECORD_DIR) == ["Settings_Project"]
+
+
+@pytest.mark.usefixtures("run_dir")
+def test_new_guide_affected(capsys):
+    """Guides missing from the record are rendered and counted"""
+    save_render_record({"Basic_Project": {"neopixel"}}, RECORD_DIR)
+    assert get_affected_guides(["Basic_Project", "New_Project"], RECORD_DIR) == [
+        "New_Project"
+    ]
+    assert "Guides not rendered before: 1" in capsys.readouterr().out
+
+
+@pytest.mark.usefixtures("run_dir")
+def test_partial_record():
+    """Updating the record for some guides keeps the others"""
+    save_render_record(
+        {
+            "Basic_Project": {"adafruit_display_text", "neopixel"},
+            "Settings_Project": {"adafruit_requests"},
+        },
+        RECORD_DIR,
+    )
+    save_render_record({"Basic_Project": {"neopixel"}}, RECORD_DIR, replace=False)
+
+    with open(os.path.join(RECORD_DIR, GUIDE_IMPORTS), encoding="utf-8") as record_file:
+        assert json.load(record_file) == {
+            "Basic_Project": ["neopixel"],
+            "Settings_Project": ["adafruit_requests"],
+        }
+
+
+@pytest.mark.usefixtures("run_dir")
+def test_records_are_separate(monkeypatch):
+    """A run into another directory or format leaves the record alone"""
+    save_render_record({"Basic_Project": {"neopixel"}}, RECORD_DIR)
+
+    # Update the bundle, then render only to other places
+    monkeypatch.setitem(
+        get_imports.bundle_data, "neopixel", {"package": True, "dependencies": []}
+    )
+    with open(get_imports.ADAFRUIT_BUNDLE_DATA, "w", encoding="utf-8") as data:
+        json.dump(get_imports.bundle_data, data)
+    for record_dir in (
+        get_record_dir("preview"),
+        get_record_dir("generated_images", ["svg"]),
+        get_record_dir("generated_images", ["png"], [1, 2]),
+    ):
+        assert record_dir != RECORD_DIR
+        save_render_record({"Basic_Project": {"neopixel"}}, record_dir)
+
+    assert get_affected_guides(["Basic_Project"], RECORD_DIR) == ["Basic_Project"]
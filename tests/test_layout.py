@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests for project discovery and the layout of requirement images
+"""
+
+import os
+
+import pytest
+
+from conftest import project_rows
+from get_imports import get_learn_guide_cp_projects
+from requirement_images import rows_to_tree
+
+PROJECTS = [
+    # settings.toml absent, libraries with dependencies
+    "Basic_Project",
+    # settings.toml present in the project
+    "Settings_Project",
+    # nested asset directories and a second level import
+    "Nested_Assets",
+    # custom lib/ folder merged into the drive's lib/
+    "Custom_Lib",
+    # a directory marked with .circuitpython.skip-screenshot
+    "Skipped_Assets",
+    # a project nested below a folder that is not a project
+    "Group/Sub_Project",
+]
+
+
+def walk_cp_projects(top):
+    """Discover projects with os.walk, as get_learn_guide_cp_projects used to"""
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        if dirpath == top:
+            continue
+        if ".circuitpython.skip-screenshot" in filenames:
+            del dirnames[:]
+            continue
+        if ".circuitpython.skip-screenshot-here" in filenames:
+            continue
+        if ".circuitpython.skip-screenshot-sub" in filenames:
+            del dirnames[:]
+        if any(f for f in filenames if f.endswith(".py")):
+            yield os.path.relpath(dirpath, top)
+
+
+def test_discovery(guides_repo):
+    """Projects are found, honouring the skip-screenshot markers"""
+    assert sorted(get_learn_guide_cp_projects()) == sorted(
+        PROJECTS
+        + [
+            # the files next to skip-screenshot-here are skipped, not sub-folders
+            "Skip_Here/Inner_Project",
+            # skip-screenshot-sub keeps the folder but not its sub-folders
+            "Skip_Sub",
+        ]
+    )
+    assert sorted(get_learn_guide_cp_projects()) == sorted(
+        walk_cp_projects(str(guides_repo))
+    )
+
+
+@pytest.mark.usefixtures("guides_repo")
+@pytest.mark.parametrize("project", PROJECTS)
+def test_layout(golden, project):
+    """The rows of each project match the golden layout"""
+    layout = [row._asdict() for row in project_rows(project)]
+    assert layout == golden.json(project.replace("/", "_"), layout)
+
+
+@pytest.mark.usefixtures("guides_repo")
+def test_collapse_threshold():
+    """Directories over the threshold end with a count of the hidden entries"""
+    names = [row.name for row in project_rows("Nested_Assets", collapse_threshold=1)]
+    assert names[names.index("fonts") + 1 : names.index("fonts") + 3] == [
+        "extra",
+        "… 1 more",
+    ]
+
+
+@pytest.mark.usefixtures("guides_repo")
+def test_tree_nesting():
+    """The JSON tree nests library rows inside lib/"""
+    tree = rows_to_tree(project_rows("Custom_Lib"))
+    assert tree["name"] == "CIRCUITPY"
+    lib = next(child for child in tree["children"] if child["name"] == "lib")
+    assert [child["name"] for child in lib["children"]] == [
+        "adafruit_bitmap_font",
+        "adafruit_display_text",
+        "custom_pkg",
+        "custom_driver.mpy",
+    ]
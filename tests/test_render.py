@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Golden image tests for the rendering of requirement images
+"""
+
+import pytest
+from PIL import Image, ImageDraw
+
+from conftest import project_rows
+from requirement_images import render_rows, render_rows_numpy, save_requirement_image
+
+pytest.importorskip("numpy")
+# pylint: disable=wrong-import-position, wrong-import-order
+from image_diff import image_difference
+
+# Allowed for differences in FreeType's anti-aliasing between versions
+CHANNEL_THRESHOLD = 64
+MAX_DIFFERING_FRACTION = 0.002
+
+
+@pytest.mark.usefixtures("guides_repo")
+@pytest.mark.parametrize("project", ["Basic_Project", "Nested_Assets", "Custom_Lib"])
+def test_golden_image(golden, project):
+    """Rendered images look the same as the golden images"""
+    image = render_rows(project_rows(project))
+    fraction, regions = image_difference(
+        golden.image(project, image), image, CHANNEL_THRESHOLD
+    )
+    assert fraction <= MAX_DIFFERING_FRACTION, f"differences in {regions}"
+
+
+@pytest.mark.usefixtures("guides_repo")
+def test_strips_match_full_image(tmp_path):
+    """Streaming an image in strips gives exactly the same pixels"""
+    rows = project_rows("Nested_Assets")
+    path = tmp_path / "strips.png"
+    # A little over 13 pixel rows per strip, so strips split rows of text
+    save_requirement_image(rows, path, memory_budget=800 * 3 * 13 + 100)
+    assert image_difference(render_rows(rows), Image.open(path)) == (0.0, [])
+
+
+@pytest.mark.usefixtures("guides_repo")
+@pytest.mark.parametrize("scale", [1, 2])
+def test_numpy_matches_pillow(scale):
+    """Both compositing engines give exactly the same pixels"""
+    rows = project_rows("Custom_Lib")
+    assert image_difference(
+        render_rows(rows, scale=scale), render_rows_numpy(rows, scale=scale)
+    ) == (0.0, [])
+
+
+def test_image_difference_regions():
+    """Each band of differing pixels is reported as one region"""
+    expected = Image.new("RGB", (100, 80), "#303030")
+    actual = expected.copy()
+    draw = ImageDraw.Draw(actual)
+    draw.rectangle([(10, 5), (19, 9)], fill="#FFFFFF")
+    draw.rectangle([(50, 40), (59, 59)], fill="#404040")
+
+    fraction, regions = image_difference(expected, actual)
+    assert regions == [(10, 5, 20, 10), (50, 40, 60, 60)]
+    assert fraction == pytest.approx((50 + 200) / (100 * 80))
+
+    # The second rectangle is only 16 away from the background
+    assert image_difference(expected, actual, threshold=16)[1] == [(10, 5, 20, 10)]
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests for the cached scan of the learn guide repo
+"""
+
+import os
+
+import pytest
+
+import get_imports
+from get_imports import get_project_listing, scan_learn_guide_tree
+
+
+@pytest.fixture
+def listed_dirs(monkeypatch):
+    """Record the directories listed with os.scandir"""
+    listed = []
+    scandir = os.scandir
+
+    def recording_scandir(path):
+        listed.append(os.path.relpath(path, get_imports.LEARN_GUIDE_REPO))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    return listed
+
+
+@pytest.mark.usefixtures("guides_repo")
+def test_unchanged_not_listed(listed_dirs):  # pylint: disable=redefined-outer-name
+    """A second scan takes every listing from the cache"""
+    first_tree = scan_learn_guide_tree()
+    assert "Nested_Assets/fonts/extra" in listed_dirs
+
+    listed_dirs.clear()
+    assert scan_learn_guide_tree() == first_tree
+    assert not listed_dirs
+
+
+def test_changed_dir_listed(
+    guides_repo, listed_dirs
+):  # pylint: disable=redefined-outer-name
+    """Only the directory with a new file is listed again"""
+    scan_learn_guide_tree()
+    fonts_dir = guides_repo / "Nested_Assets" / "fonts"
+    (fonts_dir / "medium.pcf").write_text("", encoding="utf-8")
+    # Make sure the mtime moves on even on coarse-grained filesystems
+    mtime = os.stat(fonts_dir).st_mtime_ns + 1_000_000_000
+    os.utime(fonts_dir, ns=(mtime, mtime))
+
+    listed_dirs.clear()
+    tree = scan_learn_guide_tree()
+    assert listed_dirs == ["Nested_Assets/fonts"]
+    assert "medium.pcf" in tree["Nested_Assets/fonts"]["files"]
+
+
+@pytest.mark.usefixtures("guides_repo")
+def test_unchanged_not_rewritten():
+    """The cache is only written when a listing changed"""
+    scan_learn_guide_tree()
+    os.utime(get_imports.LEARN_GUIDE_TREE_CACHE, ns=(0, 0))
+    scan_learn_guide_tree()
+    assert os.stat(get_imports.LEARN_GUIDE_TREE_CACHE).st_mtime_ns == 0
+
+
+@pytest.mark.usefixtures("guides_repo")
+def test_threaded_scan():
+    """A pool of threads finds the same tree as a sequential scan"""
+    tree = scan_learn_guide_tree(max_workers=1)
+    os.remove(get_imports.LEARN_GUIDE_TREE_CACHE)
+    assert scan_learn_guide_tree(max_workers=4) == tree
+    assert scan_learn_guide_tree(max_workers=4) == tree
+    assert scan_learn_guide_tree("Nested_Assets", max_workers=4) == {
+        rel_path: entry
+        for rel_path, entry in tree.items()
+        if rel_path.startswith("Nested_Assets")
+    }
+
+
+@pytest.mark.usefixtures("guides_repo")
+def test_project_scan_skips_cache(listed_dirs):  # pylint: disable=redefined-outer-name
+    """Scanning a single project neither reads nor writes the cache"""
+    tree = scan_learn_guide_tree("Nested_Assets")
+    assert set(get_project_listing(tree, "Nested_Assets")) == {
+        "",
+        "fonts",
+        "fonts/extra",
+        "images",
+    }
+    assert not os.path.exists(get_imports.LEARN_GUIDE_TREE_CACHE)
+
+    scan_learn_guide_tree()
+    listed_dirs.clear()
+    scan_learn_guide_tree("Nested_Assets")
+    assert "Nested_Assets/fonts" in listed_dirs